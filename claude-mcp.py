@@ -12,6 +12,7 @@ Requirements:
 - boto3 installed (pip install boto3)
 - AWS CLI configured with appropriate permissions
 - SSM agent installed on target EC2 instances
+- orjson (optional) for faster JSON serialization of the MCP context
 """
 
 import json
@@ -20,12 +21,18 @@ import time
 import datetime
 import sys
 import os
-import boto3
+import re
 import uuid
 import logging
-from botocore.exceptions import ClientError
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, List, Any, Optional, Union
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -33,26 +40,141 @@ logging.basicConfig(
 )
 logger = logging.getLogger('claude-mcp')
 
+# Upper bound on concurrent AWS requests; also sizes the botocore connection pool
+MAX_POOL_CONNECTIONS = 32
+
+# SSM command polling: start fast, back off exponentially, give up after the timeout
+COMMAND_POLL_INITIAL_DELAY = 0.3
+COMMAND_POLL_MAX_DELAY = 5.0
+COMMAND_WAIT_TIMEOUT = 600
+COMMAND_FINAL_STATUSES = ('Success', 'Cancelled', 'TimedOut', 'Failed')
+
+# How long (in seconds) describe results are reused before hitting AWS again
+INSTANCE_CACHE_TTL = 60
+SSM_CACHE_TTL = 60
+
+# Maximum number of instance IDs accepted by a single ssm:SendCommand call
+SSM_SEND_COMMAND_MAX_TARGETS = 50
+
+# Number of instance IDs passed to each describe_instances call when describing by ID
+DESCRIBE_INSTANCES_MAX_IDS = 200
+
+# EC2 instance IDs named in an InvalidInstanceID.NotFound error message
+_INSTANCE_ID_RE = re.compile(r'\bi-[0-9a-f]+\b')
+
+# Command history kept per session, and how much of each output is recorded
+COMMAND_HISTORY_MAXLEN = 50
+COMMAND_OUTPUT_MAX_CHARS = 512
+
+def _json_dumps(obj):
+    """Serialize obj to UTF-8 encoded JSON, using orjson when available."""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj).encode()
+
+def _json_loads(data):
+    """Parse JSON from str or bytes, using orjson when available."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+def _now_iso():
+    """Return the current UTC time as an ISO 8601 string with second precision."""
+    return datetime.datetime.now(datetime.timezone.utc).isoformat(timespec='seconds')
+
 class EC2Manager:
     """Manager for EC2 instances with SSM integration."""
+    
+    # boto3 sessions keyed by (profile, region), so service models are loaded once
+    _sessions = {}
 
-    def __init__(self, profile=None, region=None):
-        """Initialize with optional AWS profile and region."""
-        session_kwargs = {}
-        if profile:
-            session_kwargs['profile_name'] = profile
-        if region:
-            session_kwargs['region_name'] = region
-            
-        self.session = boto3.Session(**session_kwargs)
-        self.ec2_client = self.session.client('ec2')
-        self.ssm_client = self.session.client('ssm')
+    def __init__(self, profile=None, region=None, page_size=1000):
+        """Initialize with optional AWS profile, region and describe_instances page size."""
+        # Imported here rather than at module level so --help does not pay for loading botocore
+        from botocore.config import Config
+        from botocore.exceptions import ClientError
+        self._ClientError = ClientError
+        
+        self.session = self._get_session(profile, region)
+        client_config = Config(
+            max_pool_connections=MAX_POOL_CONNECTIONS,
+            retries={'max_attempts': 10, 'mode': 'adaptive'},
+            tcp_keepalive=True
+        )
+        self.ec2_client = self.session.client('ec2', config=client_config)
+        self.ssm_client = self.session.client('ssm', config=client_config)
         self.region = region or self.session.region_name
+        self.page_size = page_size
+        self._executor = None
+        self._cache = {}
+    
+    @classmethod
+    def _get_session(cls, profile=None, region=None):
+        """Return a boto3 session for profile/region, shared across managers."""
+        key = (profile, region)
+        if key not in cls._sessions:
+            import boto3
+            session_kwargs = {}
+            if profile:
+                session_kwargs['profile_name'] = profile
+            if region:
+                session_kwargs['region_name'] = region
+            cls._sessions[key] = boto3.Session(**session_kwargs)
+        return cls._sessions[key]
+    
+    def __del__(self):
+        """Shut down the worker pool if one was started."""
+        executor = getattr(self, '_executor', None)
+        if executor is not None:
+            executor.shutdown(wait=False)
+    
+    def _get_executor(self):
+        """Return the worker pool, creating it on first use."""
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=MAX_POOL_CONNECTIONS)
+        return self._executor
+    
+    def _cached(self, key, ttl, fn):
+        """Return the cached result of fn for key, calling it again once ttl expires."""
+        entry = self._cache.get(key)
+        now = time.monotonic()
+        if entry is not None and entry[0] > now:
+            return entry[1]
+        value = fn()
+        # Do not cache failures, so the next call retries
+        if value is not None:
+            self._store_cached(key, ttl, value)
+        return value
+    
+    def _store_cached(self, key, ttl, value):
+        """Cache value under key for ttl seconds."""
+        self._cache[key] = (time.monotonic() + ttl, value)
+    
+    def _peek_cached(self, key):
+        """Return the cached value for key if it has not expired, without fetching it."""
+        entry = self._cache.get(key)
+        if entry is not None and entry[0] > time.monotonic():
+            return entry[1]
+        return None
+    
+    def invalidate(self, include_ssm=True):
+        """Drop cached describe results, optionally keeping the SSM managed set."""
+        if include_ssm:
+            self._cache.clear()
+            return
+        ssm_entry = self._cache.get('ssm_managed_ids')
+        self._cache.clear()
+        if ssm_entry is not None:
+            self._cache['ssm_managed_ids'] = ssm_entry
         
     def list_instances(self, instance_types=None, name_prefix=None, tags=None, ssm_only=True):
         """
         List EC2 instances with optional filtering.
         
+        Results are cached for INSTANCE_CACHE_TTL seconds per set of filters,
+        unless the SSM managed instances could not be listed, in which case
+        the next call retries.
+        
         Args:
             instance_types (list): List of EC2 instance types to filter by
             name_prefix (str): Filter instances by name prefix
@@ -62,6 +184,30 @@ class EC2Manager:
         Returns:
             list: List of dictionaries containing instance information
         """
+        key = (
+            'instances',
+            tuple(instance_types or ()),
+            name_prefix,
+            tuple(sorted((tags or {}).items())),
+            ssm_only
+        )
+        instances = self._peek_cached(key)
+        if instances is None:
+            instances, complete = self._describe_instances(
+                instance_types, name_prefix, tags, ssm_only
+            )
+            if complete:
+                self._store_cached(key, INSTANCE_CACHE_TTL, instances)
+        return instances
+    
+    def _describe_instances(self, instance_types, name_prefix, tags, ssm_only):
+        """
+        Fetch running instances matching the filters from EC2.
+        
+        Returns:
+            tuple: (instances, complete), where complete is False if the SSM
+            managed instances could not be listed and the result must not be cached
+        """
         filters = []
         
         if instance_types:
@@ -86,19 +232,33 @@ class EC2Manager:
         # Only get running instances
         filters.append({'Name': 'instance-state-name', 'Values': ['running']})
         
-        response = self.ec2_client.describe_instances(Filters=filters)
+        ssm_ids = self._load_ssm_managed_ids()
+        
+        reservations = None
+        if ssm_only:
+            # Without the SSM set no instance can be confirmed reachable
+            if ssm_ids is None:
+                return [], False
+            # Nothing can match if no instance is reachable via SSM
+            if not ssm_ids:
+                return [], True
+            reservations = self._describe_reservations_by_ids(ssm_ids, filters)
+        if reservations is None:
+            reservations = self._describe_reservations(filters)
         
         instances = []
-        for reservation in response.get('Reservations', []):
+        for reservation in reservations:
             for instance in reservation.get('Instances', []):
-                # Get the instance name from tags
-                instance_name = 'Unnamed'
-                for tag in instance.get('Tags', []):
-                    if tag['Key'] == 'Name':
-                        instance_name = tag['Value']
-                        break
+                # Index tags once and get the instance name from them
+                tags_dict = {tag['Key']: tag['Value'] for tag in instance.get('Tags', [])}
+                instance_name = tags_dict.get('Name', 'Unnamed')
                 
-                ssm_status = self._check_ssm_status(instance['InstanceId'])
+                if ssm_ids is None:
+                    ssm_status = 'Unknown'
+                elif instance['InstanceId'] in ssm_ids:
+                    ssm_status = 'Available'
+                else:
+                    ssm_status = 'Not Available'
                 
                 # Skip if SSM is not available and ssm_only is True
                 if ssm_only and ssm_status != 'Available':
@@ -114,10 +274,98 @@ class EC2Manager:
                     'SSM_Status': ssm_status,
                     'LaunchTime': instance.get('LaunchTime', '').isoformat() if instance.get('LaunchTime') else 'N/A',
                     'Platform': instance.get('PlatformDetails', 'N/A'),
-                    'Tags': instance.get('Tags', [])
+                    'Tags': instance.get('Tags', []),
+                    'TagsDict': tags_dict
                 })
                 
-        return instances
+        return instances, ssm_ids is not None
+    
+    def _describe_reservations(self, filters):
+        """Yield every reservation matching the filters."""
+        # Paginate so accounts with more instances than a single page are not truncated
+        paginator = self.ec2_client.get_paginator('describe_instances')
+        pages = paginator.paginate(
+            Filters=filters,
+            PaginationConfig={'PageSize': self.page_size}
+        )
+        for page in pages:
+            yield from page.get('Reservations', [])
+    
+    def _describe_reservations_by_ids(self, instance_ids, filters):
+        """
+        Return reservations for the given instance IDs that match the filters.
+        
+        Describing only SSM-managed instances avoids fetching and parsing the
+        rest of the account. IDs that EC2 no longer knows about (e.g. instances
+        terminated since SSM was listed) are dropped and the request retried.
+        Returns None if EC2 rejects the IDs in a way that cannot be recovered
+        from, so the caller can fall back to a full scan.
+        """
+        # SSM also manages on-premises nodes (mi-*), which EC2 does not know about
+        ids = sorted(i for i in instance_ids if i.startswith('i-'))
+        reservations = []
+        # PageSize cannot be combined with InstanceIds, so chunk the IDs instead
+        for start in range(0, len(ids), DESCRIBE_INSTANCES_MAX_IDS):
+            chunk = ids[start:start + DESCRIBE_INSTANCES_MAX_IDS]
+            chunk_reservations = self._describe_chunk_by_ids(chunk, filters)
+            if chunk_reservations is None:
+                return None
+            reservations.extend(chunk_reservations)
+        return reservations
+    
+    def _describe_chunk_by_ids(self, ids, filters):
+        """Describe up to DESCRIBE_INSTANCES_MAX_IDS instances, skipping unknown IDs."""
+        paginator = self.ec2_client.get_paginator('describe_instances')
+        while ids:
+            try:
+                reservations = []
+                for page in paginator.paginate(InstanceIds=ids, Filters=filters):
+                    reservations.extend(page.get('Reservations', []))
+                return reservations
+            except self._ClientError as e:
+                error = e.response['Error']
+                if not error['Code'].startswith('InvalidInstanceID'):
+                    raise
+                missing = set(_INSTANCE_ID_RE.findall(error.get('Message', '')))
+                remaining = [i for i in ids if i not in missing]
+                if error['Code'] != 'InvalidInstanceID.NotFound' or len(remaining) == len(ids):
+                    logger.warning("Falling back to full instance scan: %s", e)
+                    return None
+                logger.debug("Skipping instances unknown to EC2: %s", sorted(missing))
+                ids = remaining
+        return []
+    
+    @property
+    def ssm_managed_ids(self):
+        """
+        Instance IDs with an online SSM agent, or None if they are not cached.
+        
+        Only an already-cached set is returned; this never triggers a full
+        describe_instance_information scan.
+        """
+        return self._peek_cached('ssm_managed_ids')
+    
+    def _load_ssm_managed_ids(self):
+        """Return the cached set of instance IDs with an online SSM agent, or None on error."""
+        return self._cached('ssm_managed_ids', SSM_CACHE_TTL, self._fetch_ssm_managed_ids)
+    
+    def _fetch_ssm_managed_ids(self):
+        """Fetch the set of instance IDs whose SSM agent is online, or None on error."""
+        try:
+            paginator = self.ssm_client.get_paginator('describe_instance_information')
+            ids = set()
+            # Without the filter SSM also returns ConnectionLost and Inactive nodes,
+            # including instances that were terminated a while ago
+            pages = paginator.paginate(
+                Filters=[{'Key': 'PingStatus', 'Values': ['Online']}],
+                PaginationConfig={'PageSize': 50}
+            )
+            for page in pages:
+                ids.update(i['InstanceId'] for i in page['InstanceInformationList'])
+            return ids
+        except self._ClientError as e:
+            logger.error("Error listing SSM managed instances: %s", e)
+            return None
     
     def _check_ssm_status(self, instance_id):
         """Check if instance is accessible via SSM."""
@@ -125,36 +373,81 @@ class EC2Manager:
             response = self.ssm_client.describe_instance_information(
                 Filters=[{'Key': 'InstanceIds', 'Values': [instance_id]}]
             )
-            if response['InstanceInformationList']:
+            info = response['InstanceInformationList']
+            if info and info[0].get('PingStatus') == 'Online':
                 return 'Available'
             return 'Not Available'
-        except ClientError:
+        except self._ClientError:
             return 'Unknown'
     
     def run_command(self, instance_ids, command, comment=''):
         """
         Run a command on specified EC2 instances through SSM.
         
+        send_command accepts at most SSM_SEND_COMMAND_MAX_TARGETS instances,
+        so larger lists are split into chunks that are sent concurrently.
+        
         Args:
             instance_ids (list): List of EC2 instance IDs
             command (str): The command to execute
             comment (str): Optional comment for the command
             
         Returns:
-            str: Command ID if successful
+            dict: Mapping of command ID to the instance IDs it was sent to;
+                  instances whose chunk failed to send are not included
         """
+        comment = comment or f'Command executed via MCP at {_now_iso()}'
+        chunks = [
+            instance_ids[i:i + SSM_SEND_COMMAND_MAX_TARGETS]
+            for i in range(0, len(instance_ids), SSM_SEND_COMMAND_MAX_TARGETS)
+        ]
+        if len(chunks) > 1:
+            command_ids = self._get_executor().map(
+                lambda chunk: self._send_command(chunk, command, comment), chunks
+            )
+        else:
+            command_ids = [self._send_command(chunk, command, comment) for chunk in chunks]
+        return {
+            command_id: chunk
+            for command_id, chunk in zip(command_ids, chunks)
+            if command_id
+        }
+    
+    def _send_command(self, instance_ids, command, comment):
+        """Send a command to at most SSM_SEND_COMMAND_MAX_TARGETS instances."""
         try:
             response = self.ssm_client.send_command(
                 InstanceIds=instance_ids,
                 DocumentName='AWS-RunShellScript',
                 Parameters={'commands': [command]},
-                Comment=comment or f'Command executed via MCP at {time.strftime("%Y-%m-%d %H:%M:%S")}'
+                Comment=comment
             )
             return response['Command']['CommandId']
-        except ClientError as e:
-            logger.error(f"Error running command: {e}")
+        except self._ClientError as e:
+            logger.error("Error running command: %s", e)
             return None
     
+    def run_commands_on_instances(self, pairs):
+        """
+        Run commands on several instances concurrently and wait for their output.
+        
+        Args:
+            pairs (list): List of (instance_id, command) tuples
+            
+        Returns:
+            dict: Mapping of (instance_id, command) to command output
+        """
+        pairs = [tuple(pair) for pair in pairs]
+        outputs = self._get_executor().map(lambda pair: self._run_and_wait(*pair), pairs)
+        return dict(zip(pairs, outputs))
+    
+    def _run_and_wait(self, instance_id, command):
+        """Run a command on a single instance and wait for its output."""
+        command_ids = self.run_command([instance_id], command)
+        if not command_ids:
+            return {'Status': 'Failed', 'Output': '', 'Error': 'Failed to send command'}
+        return self.get_command_output(next(iter(command_ids)), instance_id)
+    
     def get_command_output(self, command_id, instance_id, wait=True):
         """
         Get the output of a command execution.
@@ -168,32 +461,88 @@ class EC2Manager:
             dict: Command output status and content
         """
         try:
-            # Wait for command to complete if requested
+            # Wait on the overall command status, then fetch this instance's output once
             if wait:
-                waiter = self.ssm_client.get_waiter('command_executed')
-                waiter.wait(
-                    CommandId=command_id,
-                    InstanceId=instance_id
-                )
+                self._wait_command_overall(command_id)
+            response = self._get_command_invocation(command_id, instance_id)
             
-            # Get the output
-            response = self.ssm_client.get_command_invocation(
-                CommandId=command_id,
-                InstanceId=instance_id
-            )
+            if response is None:
+                return {
+                    'Status': 'Failed',
+                    'Output': '',
+                    'Error': f'No invocation of {command_id} found on {instance_id}'
+                }
             
             return {
                 'Status': response['Status'],
                 'Output': response.get('StandardOutputContent', ''),
                 'Error': response.get('StandardErrorContent', '')
             }
-        except ClientError as e:
-            logger.error(f"Error getting command output: {e}")
+        except self._ClientError as e:
+            logger.error("Error getting command output: %s", e)
             return {
                 'Status': 'Failed',
                 'Output': '',
                 'Error': str(e)
             }
+    
+    def get_command_outputs(self, command_id, instance_ids, wait=True):
+        """
+        Get the output of a command sent to several instances.
+        
+        Args:
+            command_id (str): The command ID from run_command
+            instance_ids (list): The instance IDs the command was run on
+            wait (bool): Whether to wait for command completion
+            
+        Returns:
+            dict: Mapping of instance ID to command output status and content
+        """
+        if wait:
+            try:
+                self._wait_command_overall(command_id)
+            except self._ClientError as e:
+                logger.error("Error waiting for command: %s", e)
+        outputs = self._get_executor().map(
+            lambda instance_id: self.get_command_output(command_id, instance_id, wait=False),
+            instance_ids
+        )
+        return dict(zip(instance_ids, outputs))
+    
+    def _wait_command_overall(self, command_id, timeout=COMMAND_WAIT_TIMEOUT):
+        """
+        Wait until a command reaches a final status on all of its targets.
+        
+        A single list_commands call reports the overall status however many
+        instances the command was sent to. Polls with exponential backoff so
+        short commands return promptly.
+        
+        Returns:
+            str: The final status, or the last seen status if the timeout expired
+        """
+        delay = COMMAND_POLL_INITIAL_DELAY
+        deadline = time.monotonic() + timeout
+        status = None
+        while True:
+            response = self.ssm_client.list_commands(CommandId=command_id)
+            if response and response.get('Commands'):
+                status = response['Commands'][0]['Status']
+                if status in COMMAND_FINAL_STATUSES:
+                    return status
+            if time.monotonic() >= deadline:
+                return status
+            time.sleep(delay)
+            delay = min(delay * 1.7, COMMAND_POLL_MAX_DELAY)
+    
+    def _get_command_invocation(self, command_id, instance_id):
+        """Fetch a command invocation, or None if it is not registered yet."""
+        try:
+            return self.ssm_client.get_command_invocation(
+                CommandId=command_id,
+                InstanceId=instance_id
+            )
+        except self.ssm_client.exceptions.InvocationDoesNotExist:
+            return None
 
 class ModelContextProtocol:
     """
@@ -205,25 +554,35 @@ class ModelContextProtocol:
     
     def __init__(self, ec2_manager=None, profile=None, region=None):
         """Initialize the MCP with an optional EC2Manager."""
+        from botocore.config import Config
         self.ec2_manager = ec2_manager or EC2Manager(profile=profile, region=region)
-        self.bedrock_client = boto3.client('bedrock-runtime')
+        # Reuse the manager's session so the profile and region are honoured
+        self.bedrock_client = self.ec2_manager.session.client(
+            'bedrock-runtime',
+            config=Config(
+                max_pool_connections=16,
+                retries={'max_attempts': 5, 'mode': 'adaptive'},
+                tcp_keepalive=True
+            )
+        )
         self.claude_model_id = 'anthropic.claude-3-sonnet-20240229-v1:0'  # Update as needed
         self.session_data = {
             'session_id': str(uuid.uuid4()),
-            'start_time': datetime.datetime.now().isoformat(),
-            'commands': []
+            'start_time': _now_iso(),
+            'commands': deque(maxlen=COMMAND_HISTORY_MAXLEN)
         }
+        # Bumped on every recorded command so cached contexts can tell history changed
+        self._commands_recorded = 0
+        # (instances, options, context) of the last generated context
+        self._last_context = (None, None, None)
+        # (context, mcp_json) of the last serialized context
+        self._context_cache = (None, None)
     
     def _format_instances_for_context(self, instances):
         """Format EC2 instance information for Claude context."""
         # Simplify the instance data to include only what's needed for context
         simplified = []
         for instance in instances:
-            # Extract useful tags as a dictionary
-            tags_dict = {}
-            for tag in instance.get('Tags', []):
-                tags_dict[tag['Key']] = tag['Value']
-                
             simplified.append({
                 'id': instance['InstanceId'],
                 'name': instance['Name'],
@@ -231,12 +590,13 @@ class ModelContextProtocol:
                 'private_ip': instance['PrivateIP'],
                 'platform': instance['Platform'],
                 'ssm_status': instance['SSM_Status'],
-                'tags': tags_dict
+                'tags': instance['TagsDict']
             })
         
         return simplified
         
-    def generate_context(self, instance_types=None, name_prefix=None, tags=None, include_commands=True):
+    def generate_context(self, instance_types=None, name_prefix=None, tags=None, include_commands=True,
+                         instances=None, max_commands=10):
         """
         Generate context information for Claude based on infrastructure.
         
@@ -245,16 +605,26 @@ class ModelContextProtocol:
             name_prefix (str): Filter instances by name prefix
             tags (dict): Dictionary of tag key-value pairs to filter by
             include_commands (bool): Whether to include command history
+            instances (list): Already listed instances; skips list_instances when given
+            max_commands (int): Number of most recent commands to include
             
         Returns:
             dict: Context data in MCP format
         """
         # Get EC2 instances
-        instances = self.ec2_manager.list_instances(
-            instance_types=instance_types,
-            name_prefix=name_prefix,
-            tags=tags
-        )
+        if instances is None:
+            instances = self.ec2_manager.list_instances(
+                instance_types=instance_types,
+                name_prefix=name_prefix,
+                tags=tags
+            )
+        
+        # Return the previous context object if nothing it was built from has changed,
+        # so query_claude can reuse its serialized form
+        options = (include_commands, max_commands, self._commands_recorded)
+        last_instances, last_options, last_context = self._last_context
+        if instances is last_instances and options == last_options:
+            return last_context
         
         # Format context information
         context = {
@@ -270,9 +640,10 @@ class ModelContextProtocol:
         }
         
         # Include command history if requested
-        if include_commands and self.session_data['commands']:
-            context["command_history"] = self.session_data['commands']
+        if include_commands and self.session_data['commands'] and max_commands > 0:
+            context["command_history"] = list(self.session_data['commands'])[-max_commands:]
         
+        self._last_context = (instances, options, context)
         return context
     
     def run_command_on_instance(self, instance_id, command):
@@ -286,28 +657,38 @@ class ModelContextProtocol:
         Returns:
             dict: Command output
         """
-        command_id = self.ec2_manager.run_command([instance_id], command)
-        if not command_id:
-            return {"status": "Failed", "error": "Failed to send command"}
+        # Skip the send_command round-trip if the SSM agent is known to be offline.
+        # The cached set only holds instances whose agent was Online at the last
+        # listing. Only a set cached by that listing is consulted, so a cold
+        # cache costs nothing here and the command is sent as before.
+        ssm_ids = self.ec2_manager.ssm_managed_ids
+        if ssm_ids is not None and instance_id not in ssm_ids:
+            return {"Status": "Failed", "Output": "", "Error": f"SSM unavailable on {instance_id}"}
+        
+        command_ids = self.ec2_manager.run_command([instance_id], command)
+        if not command_ids:
+            return {"Status": "Failed", "Output": "", "Error": "Failed to send command"}
+        command_id = next(iter(command_ids))
         
         # Get the output
         output = self.ec2_manager.get_command_output(command_id, instance_id)
         
         # Record in command history
         command_record = {
-            "timestamp": datetime.datetime.now().isoformat(),
+            "timestamp": _now_iso(),
             "instance_id": instance_id,
             "command": command,
             "status": output['Status'],
-            "output": output['Output'][:1000] if len(output['Output']) > 1000 else output['Output'],
+            "output": output['Output'][:COMMAND_OUTPUT_MAX_CHARS],
             "command_id": command_id
         }
         
         self.session_data['commands'].append(command_record)
+        self._commands_recorded += 1
         
         return output
     
-    def query_claude(self, user_message, context=None, max_tokens=1000, temperature=0.7):
+    def query_claude(self, user_message, context=None, max_tokens=1000, temperature=0.7, stream=False):
         """
         Send a query to Claude on Bedrock with MCP context.
         
@@ -316,6 +697,7 @@ class ModelContextProtocol:
             context (dict): Optional context override, otherwise uses generated context
             max_tokens (int): Maximum tokens in response
             temperature (float): Sampling temperature
+            stream (bool): Write the response to stdout as it is generated
             
         Returns:
             str: Claude's response
@@ -324,8 +706,12 @@ class ModelContextProtocol:
         if context is None:
             context = self.generate_context()
         
-        # Format prompt with MCP
-        mcp_json = json.dumps(context)
+        # Format prompt with MCP, reusing the serialized form of an unchanged context
+        if context is self._context_cache[0]:
+            mcp_json = self._context_cache[1]
+        else:
+            mcp_json = _json_dumps(context).decode()
+            self._context_cache = (context, mcp_json)
         
         # Use the Anthropic message API format
         messages = [
@@ -349,19 +735,45 @@ class ModelContextProtocol:
         }
         
         try:
+            if stream:
+                # Print tokens as they arrive instead of waiting for the full body
+                response = self.bedrock_client.invoke_model_with_response_stream(
+                    modelId=self.claude_model_id,
+                    body=_json_dumps(payload)
+                )
+                return self._write_response_stream(response['body'])
+            
             # Send request to Bedrock
             response = self.bedrock_client.invoke_model(
                 modelId=self.claude_model_id,
-                body=json.dumps(payload)
+                body=_json_dumps(payload)
             )
             
             # Parse the response
-            response_body = json.loads(response['body'].read())
+            response_body = _json_loads(response['body'].read())
             return response_body['content'][0]['text']
             
         except Exception as e:
-            logger.error(f"Error querying Claude: {e}")
-            return f"Error communicating with Claude: {str(e)}"
+            logger.error("Error querying Claude: %s", e)
+            message = f"Error communicating with Claude: {str(e)}"
+            if stream:
+                sys.stdout.write(message)
+                sys.stdout.flush()
+            return message
+    
+    def _write_response_stream(self, event_stream):
+        """Write text deltas from a Bedrock response stream to stdout and return the full text."""
+        parts = []
+        for event in event_stream:
+            if 'chunk' not in event:
+                continue
+            chunk = _json_loads(event['chunk']['bytes'])
+            if chunk['type'] == 'content_block_delta' and chunk['delta'].get('type') == 'text_delta':
+                text = chunk['delta']['text']
+                sys.stdout.write(text)
+                sys.stdout.flush()
+                parts.append(text)
+        return ''.join(parts)
 
 def display_instances(instances):
     """Pretty print the instances list."""
@@ -369,12 +781,19 @@ def display_instances(instances):
         print("No instances found matching the criteria.")
         return
     
-    # Calculate column widths
-    id_width = max(len(i['InstanceId']) for i in instances) + 2
-    name_width = max(len(i['Name']) for i in instances) + 2
-    type_width = max(len(i['Type']) for i in instances) + 2
-    ip_width = max(len(i['PrivateIP']) for i in instances) + 2
-    ssm_width = max(len(i['SSM_Status']) for i in instances) + 2
+    # Calculate column widths in a single pass over the instances
+    id_width = name_width = type_width = ip_width = ssm_width = 0
+    for i in instances:
+        id_width = max(id_width, len(i['InstanceId']))
+        name_width = max(name_width, len(i['Name']))
+        type_width = max(type_width, len(i['Type']))
+        ip_width = max(ip_width, len(i['PrivateIP']))
+        ssm_width = max(ssm_width, len(i['SSM_Status']))
+    id_width += 2
+    name_width += 2
+    type_width += 2
+    ip_width += 2
+    ssm_width += 2
     
     # Print header
     header = f"{'#':<3} {'ID':<{id_width}} {'Name':<{name_width}} {'Type':<{type_width}} " \
@@ -401,6 +820,7 @@ def interactive_mode(mcp):
         if user_input.lower() == 'exit':
             break
         elif user_input.lower() == 'list':
+            mcp.ec2_manager.invalidate()
             instances = mcp.ec2_manager.list_instances()
             display_instances(instances)
             continue
@@ -434,13 +854,22 @@ def interactive_mode(mcp):
             if output['Error']:
                 print("--- Error ---")
                 print(output['Error'])
-                
+            
+            # The command may have changed the instances, so re-list before the next query.
+            # SSM agent registrations rarely change with a command, so keep that set.
+            mcp.ec2_manager.invalidate(include_ssm=False)
             continue
         
-        # Normal query to Claude with MCP context
+        # Normal query to Claude with MCP context, reusing the instance list
+        # (served from the cache unless it expired or a command invalidated it).
+        # Kept separate from `instances`, which 'run #' resolves against and must
+        # stay the list the user last saw.
+        context_instances = mcp.ec2_manager.list_instances()
+        context = mcp.generate_context(instances=context_instances)
         print("Querying Claude with MCP context...")
-        response = mcp.query_claude(user_input)
-        print("\nClaude:", response)
+        print("\nClaude: ", end='', flush=True)
+        mcp.query_claude(user_input, context=context, stream=True)
+        print()
 
 def main():
     parser = argparse.ArgumentParser(description='Model Context Protocol (MCP) for Claude on AWS Bedrock')
@@ -472,18 +901,19 @@ def main():
         for key, value in args.tag:
             tags[key] = value
     
-    # Initialize MCP with EC2 manager
-    mcp = ModelContextProtocol(profile=args.profile, region=args.region)
-    
-    # Just list instances if requested
+    # Just list instances if requested; this does not need a Bedrock client
     if args.list_only:
-        instances = mcp.ec2_manager.list_instances(
+        ec2_manager = EC2Manager(profile=args.profile, region=args.region)
+        instances = ec2_manager.list_instances(
             instance_types=args.types,
             name_prefix=args.name_prefix,
             tags=tags
         )
         display_instances(instances)
         return
+    
+    # Initialize MCP with EC2 manager
+    mcp = ModelContextProtocol(profile=args.profile, region=args.region)
         
     # Run a command on an instance if both instance and command are provided
     if args.instance and args.command:
@@ -1,17 +1,54 @@
-from functools import lru_cache
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache, wraps
+from itertools import islice
 import json
 import os
 import re
+import tempfile
+import time
 from mcp.server.fastmcp import FastMCP, Context
 import boto3
+from botocore.config import Config
 import datetime
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Tuple
+from urllib.parse import parse_qs, urlparse
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 
 mcp = FastMCP("PyTorch infra")
-cloudtrail = boto3.client("cloudtrail")
-cloudwatch = boto3.client("logs")
+# Clients are created once and shared by all tools; boto3 clients are thread-safe
+_SESSION = boto3.Session()
+cloudtrail = _SESSION.client("cloudtrail")
+# Sized for the concurrent per-log-group queries in query_log_streams
+cloudwatch = _SESSION.client("logs", config=Config(max_pool_connections=32))
+ec2 = _SESSION.client(
+    "ec2", config=Config(retries={"mode": "adaptive"}, max_pool_connections=32)
+)
+
+# Shared HTTP session: keeps connections alive across pages and retries
+# rate limiting and transient server errors
+_HTTP = requests.Session()
+_HTTP.mount(
+    "https://",
+    HTTPAdapter(
+        pool_connections=16,
+        pool_maxsize=16,
+        max_retries=Retry(
+            total=3, backoff_factor=0.3, status_forcelist=[429, 502, 503, 504]
+        ),
+    ),
+)
+_HTTP.headers.update({"Accept": "application/vnd.github.v3+json"})
+# (connect, read) timeouts so a stuck request cannot block the MCP server
+GITHUB_TIMEOUT = (3.05, 10)
 
 
 DEFAULT_LOG_GROUPS = [
@@ -20,8 +57,96 @@ DEFAULT_LOG_GROUPS = [
     "/aws/lambda/gh-ci-scale-up-chron",
 ]
 
+# Characters that make a runner search string a regular expression
+_REGEX_METACHARS = frozenset(".^$*+?{}[]\\|()")
+
+# EC2 instance type catalog, as (expiry, sorted names)
+INSTANCE_TYPES_CACHE_TTL = 24 * 3600
+_instance_types_cache: Tuple[float, Tuple[str, ...]] = (0.0, ())
+
+# Leading characters that mark a string as CloudWatch Logs filter pattern syntax
+_FILTER_PATTERN_SYNTAX_RE = re.compile(r'\s*[{\["%?]')
+
+# One entry of a GitHub Link header: <url>; rel="name"
+_LINK_RE = re.compile(r'<([^>]+)>;\s*rel="([^"]+)"')
+
+# GitHub runners are cached on disk so they are shared across processes of the
+# same user; the uid in the name keeps other users of a shared /tmp out of it
+GH_RUNNERS_CACHE_PATH = os.path.join(
+    tempfile.gettempdir(),
+    f"gh_runners-{os.getuid()}.json" if hasattr(os, "getuid") else "gh_runners.json",
+)
+GH_RUNNERS_CACHE_TTL = 60
+
+
+def _json_dumps(obj: Any) -> bytes:
+    """Serialize obj to UTF-8 encoded JSON, using orjson when available"""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj).encode()
+
+
+def _json_loads(data: Any) -> Any:
+    """Parse JSON from str or bytes, using orjson when available"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _run_in_thread(fn):
+    """
+    Turn a blocking tool into a coroutine that runs it in a worker thread
+
+    FastMCP awaits coroutine tools on its event loop, so concurrent tool calls
+    overlap their AWS and GitHub I/O instead of blocking the loop one at a time.
+    """
+
+    @wraps(fn)
+    async def wrapper(*args, **kwargs):
+        return await asyncio.to_thread(fn, *args, **kwargs)
+
+    return wrapper
+
+
+@lru_cache(maxsize=256)
+def _parse_iso(timestamp: str) -> datetime.datetime:
+    """Parse an ISO 8601 timestamp, accepting a trailing Z for UTC"""
+    if timestamp.endswith("Z"):
+        timestamp = timestamp[:-1] + "+00:00"
+    return datetime.datetime.fromisoformat(timestamp)
+
+
+@lru_cache(maxsize=256)
+def _iso_to_ms(timestamp: str) -> int:
+    """Convert an ISO 8601 timestamp to milliseconds since epoch"""
+    return int(_parse_iso(timestamp).timestamp() * 1000)
+
+
+def _flatten_event(
+    event: Dict[str, Any], include_raw_event: bool = False
+) -> Dict[str, Any]:
+    """Reduce a CloudTrail event to the fields returned by get_cloudtrail_events"""
+    get = event.get
+    event_time = get("EventTime")
+    flat = {
+        # Every CloudTrail event has an ID and a name
+        "event_id": event["EventId"],
+        "event_name": event["EventName"],
+        "event_time": event_time.isoformat() if event_time else None,
+        "username": get("Username"),
+        "resources": get("Resources"),
+    }
+    if include_raw_event:
+        # The full record is a JSON string; parse it so it is not re-escaped on output
+        cloud_trail_event = get("CloudTrailEvent")
+        flat["cloud_trail_event"] = (
+            _json_loads(cloud_trail_event) if cloud_trail_event else None
+        )
+    return flat
+
 
 @mcp.tool()
+@_run_in_thread
 def get_cloudtrail_events(
     resource_name: str,
     resource_type: Optional[str] = None,
@@ -29,6 +154,8 @@ def get_cloudtrail_events(
     start_time: Optional[str] = None,
     end_time: Optional[str] = None,
     max_results: int = 50,
+    next_token: Optional[str] = None,
+    include_raw_event: bool = False,
     ctx: Optional[Context] = None,
 ) -> Dict[str, Any]:
     """Get CloudTrail events for a specific resource.
@@ -40,68 +167,96 @@ def get_cloudtrail_events(
         start_time: Optional start time in ISO format (e.g. 2023-01-01T00:00:00Z)
         end_time: Optional end time in ISO format
         max_results: Maximum number of results to return (default: 50)
+        next_token: Optional next_token from a previous call, to fetch the next
+            events with the same filters
+        include_raw_event: Also return the full CloudTrail record of each event
+            as cloud_trail_event (default: False, as it can be several KB per event)
 
     Returns:
-        Dictionary containing CloudTrail events and metadata
+        Dictionary containing CloudTrail events and metadata. next_token is set
+        when more events are available and is only valid for this tool's
+        next_token argument, not for the CloudTrail API
     """
-    # Build the lookup attributes
+    # Build the lookup attributes, skipping filters that were not given
     lookup_attributes = [
-        {"AttributeKey": "ResourceName", "AttributeValue": resource_name}
-    ]
-
-    if resource_type:
-        lookup_attributes.append(
-            {"AttributeKey": "ResourceType", "AttributeValue": resource_type}
+        {"AttributeKey": key, "AttributeValue": value}
+        for key, value in (
+            ("ResourceName", resource_name),
+            ("ResourceType", resource_type),
+            ("EventName", event_name),
         )
+        if value
+    ]
 
     # Build the request parameters
-    params = {"LookupAttributes": lookup_attributes, "MaxResults": max_results}
+    params = {
+        "LookupAttributes": lookup_attributes,
+        "PaginationConfig": {
+            "MaxItems": max_results,
+            "PageSize": min(max_results, 50),
+        },
+    }
+    if next_token:
+        params["PaginationConfig"]["StartingToken"] = next_token
 
     # Convert ISO strings to datetime objects if provided
     if start_time:
-        params["StartTime"] = datetime.datetime.fromisoformat(
-            start_time.replace("Z", "+00:00")
-        )
+        params["StartTime"] = _parse_iso(start_time)
     if end_time:
-        params["EndTime"] = datetime.datetime.fromisoformat(
-            end_time.replace("Z", "+00:00")
-        )
-
-    # Add optional event name filter using another lookup attribute
-    if event_name:
-        lookup_attributes.append(
-            {"AttributeKey": "EventName", "AttributeValue": event_name}
-        )
+        params["EndTime"] = _parse_iso(end_time)
 
     # Make the API call to CloudTrail
     try:
-        response = cloudtrail.lookup_events(**params)
-
-        # Process the events
-        events = []
-        for event in response.get("Events", []):
-            events.append(
-                {
-                    "event_id": event.get("EventId"),
-                    "event_name": event.get("EventName"),
-                    "event_time": event.get("EventTime").isoformat()
-                    if event.get("EventTime")
-                    else None,
-                    "username": event.get("Username"),
-                    "resources": event.get("Resources"),
-                }
-            )
+        pages = cloudtrail.get_paginator("lookup_events").paginate(**params)
+
+        # MaxItems caps the events at max_results; the paginator must be run
+        # to completion for it to set resume_token
+        events = [
+            _flatten_event(event, include_raw_event)
+            for page in pages
+            for event in page.get("Events", [])
+        ]
 
         return {
             "total_events": len(events),
             "events": events,
-            "next_token": response.get("NextToken"),
+            # Set by the paginator when MaxItems cut the results short; pass it
+            # back as next_token to continue
+            "next_token": pages.resume_token,
         }
     except Exception as e:
         return {"error": str(e), "status": "failed"}
 
 
+def _log_streams_in_range(
+    log_group: str, start_time_ms: int, end_time_ms: int
+) -> List[Dict]:
+    """
+    List the streams of a log group whose last event falls within a time range
+
+    Streams are requested newest first, so paging stops at the first stream
+    whose last event is older than the start of the range.
+    """
+    streams = []
+    pages = cloudwatch.get_paginator("describe_log_streams").paginate(
+        logGroupName=log_group,
+        orderBy="LastEventTime",
+        descending=True,
+        PaginationConfig={"PageSize": 50},
+    )
+    for stream in (stream for page in pages for stream in page["logStreams"]):
+        last_event_ms = stream.get("lastEventTimestamp")
+        if last_event_ms is None:
+            continue
+        if last_event_ms < start_time_ms:
+            break
+        if last_event_ms <= end_time_ms:
+            streams.append(stream)
+    return streams
+
+
 @mcp.tool()
+@_run_in_thread
 def list_log_streams(
     start_time: Optional[str] = None,
     end_time: Optional[str] = None,
@@ -121,48 +276,19 @@ def list_log_streams(
     """
     result = {}
 
-    # Convert ISO strings to milliseconds since epoch for CloudWatch
-    if start_time:
-        start_time_ms = int(
-            datetime.datetime.fromisoformat(
-                start_time.replace("Z", "+00:00")
-            ).timestamp()
-            * 1000
-        )
-    if end_time:
-        end_time_ms = int(
-            datetime.datetime.fromisoformat(end_time.replace("Z", "+00:00")).timestamp()
-            * 1000
-        )
+    # Convert ISO strings to milliseconds since epoch for CloudWatch,
+    # defaulting to the last 24 hours
+    now_ms = int(time.time() * 1000)
+    end_time_ms = _iso_to_ms(end_time) if end_time else now_ms
+    start_time_ms = (
+        _iso_to_ms(start_time) if start_time else end_time_ms - 24 * 3600 * 1000
+    )
 
     for log_group in log_groups:
-        streams = []
-        paginator = cloudwatch.get_paginator("describe_log_streams")
-
         try:
-            found = False
-            # Use orderBy='LastEventTime' to get streams with events in our time range
-            for page in paginator.paginate(
-                logGroupName=log_group, orderBy="LastEventTime", descending=True
-            ):
-                for stream in page["logStreams"]:
-                    # Filter streams that have events within our time range
-                    if (
-                        "lastEventTimestamp" in stream
-                        and start_time_ms <= stream["lastEventTimestamp"] <= end_time_ms
-                    ):
-                        found = True
-                        streams.append(stream)
-                    elif (
-                        "lastEventTimestamp" in stream
-                        and stream["lastEventTimestamp"] < start_time_ms
-                    ):
-                        break
-
-                if found:
-                    break
-
-            result[log_group] = streams
+            result[log_group] = _log_streams_in_range(
+                log_group, start_time_ms, end_time_ms
+            )
         except cloudwatch.exceptions.ResourceNotFoundException:
             result[log_group] = []
             print(f"Log group {log_group} not found")
@@ -170,23 +296,84 @@ def list_log_streams(
     return result
 
 
+def _to_filter_pattern(search_pattern: str) -> str:
+    """
+    Convert a search string into a CloudWatch Logs filter pattern
+
+    Strings that start with filter pattern syntax are passed through: JSON
+    ({...}), bracketed space-delimited ([...]), quoted ("..."), %regex% and
+    ?OR terms. Anything else, including plain space-separated terms, is
+    quoted so it matches as a single literal substring.
+    """
+    if not search_pattern or _FILTER_PATTERN_SYNTAX_RE.match(search_pattern):
+        return search_pattern
+    return '"' + search_pattern.replace('"', '\\"') + '"'
+
+
+def _query_one_group(
+    log_group: str,
+    start_time_ms: Optional[int],
+    end_time_ms: Optional[int],
+    search_pattern: str,
+    log_stream_names: List[str],
+    max_messages: int,
+) -> Optional[List[str]]:
+    """
+    Query a single CloudWatch log group for a pattern.
+
+    Returns:
+        List of matching log messages, or None if the group could not be queried
+    """
+    try:
+        params = {
+            "logGroupName": log_group,
+            "filterPattern": _to_filter_pattern(search_pattern),
+        }
+        if start_time_ms is not None:
+            params["startTime"] = start_time_ms
+        if end_time_ms is not None:
+            params["endTime"] = end_time_ms
+        if log_stream_names:
+            params["logStreamNames"] = log_stream_names
+
+        # Keep only the messages, and stop paging once max_messages are collected
+        pages = cloudwatch.get_paginator("filter_log_events").paginate(**params)
+        messages = (
+            e.get("message", "") for page in pages for e in page.get("events", [])
+        )
+        return list(islice(messages, max_messages))
+
+    except cloudwatch.exceptions.ResourceNotFoundException:
+        print(f"Log group {log_group} does not exist, skipping...")
+        return None
+    except Exception as e:
+        print(f"Error querying {log_group}: {str(e)}")
+        return None
+
+
 @mcp.tool()
+@_run_in_thread
 def query_log_streams(
     search_pattern: str,
     start_time: Optional[str] = None,
     end_time: Optional[str] = None,
     log_groups: Optional[List[str]] = DEFAULT_LOG_GROUPS,
     log_stream_names: Optional[List[str]] = [],
+    max_messages: int = 10000,
     ctx: Optional[Context] = None,
 ) -> Dict[str, List[Dict[str, Any]]]:
     """
     Query CloudWatch logs for a specific pattern within a time period.
 
     Args:
-        search_pattern: Pattern to search for in the logs
+        search_pattern: Literal substring to search for in the logs, spaces and
+            punctuation included. To use CloudWatch filter pattern syntax, start
+            the pattern with {, [, ", % or ?; e.g. "error|timeout" matches that
+            exact text, while "%error|timeout%" matches either word
         start_time: The start time as a datetime object
         end_time: The end time as a datetime object
         log_groups: List of log groups to query (if None, will query all available log groups)
+        max_messages: Maximum number of messages per log group (default: 10000)
 
     Returns:
         Dictionary mapping log group names to their events
@@ -194,63 +381,37 @@ def query_log_streams(
     results = {}
 
     # Convert ISO strings to milliseconds since epoch for CloudWatch
-    if start_time:
-        start_time_ms = int(
-            datetime.datetime.fromisoformat(
-                start_time.replace("Z", "+00:00")
-            ).timestamp()
-            * 1000
-        )
-    if end_time:
-        end_time_ms = int(
-            datetime.datetime.fromisoformat(end_time.replace("Z", "+00:00")).timestamp()
-            * 1000
-        )
-
-    # Query each log group
-    for log_group in log_groups:
-        try:
-            # Check if log group exists
-            try:
-                cloudwatch.describe_log_groups(logGroupNamePrefix=log_group)
-            except cloudwatch.exceptions.ResourceNotFoundException:
-                print(f"Log group {log_group} does not exist, skipping...")
-                continue
-
-            # Get log streams for this group
-            response = cloudwatch.filter_log_events(
-                logGroupName=log_group,
-                startTime=start_time_ms,
-                endTime=end_time_ms,
-                filterPattern=f"%{search_pattern}%",
-                limit=10000,  # Adjust limit as needed
-            )
-
-            events = response.get("events", [])
-
-            # Handle pagination if there are more results
-            while "nextToken" in response:
-                response = cloudwatch.filter_log_events(
-                    logGroupName=log_group,
-                    logStreamNames=log_stream_names,
-                    startTime=start_time_ms,
-                    endTime=end_time_ms,
-                    filterPattern=f"%{search_pattern}%",
-                    nextToken=response["nextToken"],
-                    limit=10000,
-                )
-                events.extend(response.get("events", []))
-
-            if events:
-                results[log_group] = [e.get("message", "") for e in events]
-
-        except Exception as e:
-            print(f"Error querying {log_group}: {str(e)}")
+    start_time_ms = _iso_to_ms(start_time) if start_time else None
+    end_time_ms = _iso_to_ms(end_time) if end_time else None
+
+    if not log_groups:
+        return results
+
+    # Query the log groups concurrently; the boto3 client is thread-safe
+    with ThreadPoolExecutor(max_workers=max(1, min(32, len(log_groups)))) as ex:
+        futures = {
+            ex.submit(
+                _query_one_group,
+                log_group,
+                start_time_ms,
+                end_time_ms,
+                search_pattern,
+                log_stream_names,
+                max_messages,
+            ): log_group
+            for log_group in log_groups
+        }
+        # Collect in submission order so results follow the order of log_groups
+        for future, log_group in futures.items():
+            messages = future.result()
+            if messages:
+                results[log_group] = messages
 
     return results
 
 
 @mcp.tool()
+@_run_in_thread
 def num_ec2_instances(instance_type: Optional[str] = None) -> int:
     """
     List EC2 instances with optional filtering by instance type
@@ -262,8 +423,6 @@ def num_ec2_instances(instance_type: Optional[str] = None) -> int:
     Returns:
         Number of active instances matching the filter
     """
-    ec2 = boto3.client("ec2")
-
     # Create filters
     filters = [{"Name": "instance-state-name", "Values": ["running"]}]
 
@@ -271,18 +430,19 @@ def num_ec2_instances(instance_type: Optional[str] = None) -> int:
     if instance_type:
         filters.append({"Name": "instance-type", "Values": [instance_type]})
 
-    # Get instances
-    response = ec2.describe_instances(Filters=filters)
-
-    # Count instances across all reservations
-    count = 0
-    for reservation in response.get("Reservations", []):
-        count += len(reservation.get("Instances", []))
-
-    return count
+    # Count instances across all reservations on every page
+    pages = ec2.get_paginator("describe_instances").paginate(
+        Filters=filters, PaginationConfig={"PageSize": 1000}
+    )
+    return sum(
+        len(reservation.get("Instances", []))
+        for page in pages
+        for reservation in page.get("Reservations", [])
+    )
 
 
 @mcp.tool()
+@_run_in_thread
 def list_ec2_instances_types(search_string: Optional[str] = None) -> List[str]:
     """
     List EC2 instance types with optional filtering by search string
@@ -293,33 +453,109 @@ def list_ec2_instances_types(search_string: Optional[str] = None) -> List[str]:
     Returns:
         List of instance types matching the filter
     """
-    ec2 = boto3.client("ec2")
-
-    # Initialize variables for pagination
-    all_instance_types = []
-    next_token = None
-
-    # Loop to handle pagination from AWS API
-    while True:
-        # Prepare parameters for the API call
-        params = {}
-        if next_token:
-            params["NextToken"] = next_token
-
-        # Get instance types with pagination
-        response = ec2.describe_instance_types(**params)
-
-        # Add instance types from this page
-        for it in response["InstanceTypes"]:
-            if search_string is None or search_string in it["InstanceType"]:
-                all_instance_types.append(it["InstanceType"])
-
-        # Check if there are more pages
-        next_token = response.get("NextToken")
-        if not next_token:
-            break
+    instance_types = _all_instance_types()
+    if search_string is None:
+        return list(instance_types)
+    return [it for it in instance_types if search_string in it]
+
+
+def _all_instance_types() -> Tuple[str, ...]:
+    """
+    Sorted names of all EC2 instance types offered in the region
+
+    The catalog rarely changes, so it is fetched once and reused for
+    INSTANCE_TYPES_CACHE_TTL seconds.
+    """
+    global _instance_types_cache
+    expiry, instance_types = _instance_types_cache
+    if expiry > time.monotonic():
+        return instance_types
+
+    pages = ec2.get_paginator("describe_instance_types").paginate()
+    instance_types = tuple(
+        sorted(it["InstanceType"] for page in pages for it in page["InstanceTypes"])
+    )
+    _instance_types_cache = (
+        time.monotonic() + INSTANCE_TYPES_CACHE_TTL,
+        instance_types,
+    )
+    return instance_types
+
+
+def _parse_link_header(link_header: Optional[str]) -> Dict[str, str]:
+    """
+    Parse a GitHub Link header into a mapping of rel to URL
 
-    return all_instance_types
+    Args:
+        link_header: Header of the form <url>; rel="next", <url>; rel="last"
+
+    Returns:
+        Dictionary mapping rel values (e.g. "next", "last") to URLs
+    """
+    if not link_header:
+        return {}
+    return {m.group(2): m.group(1) for m in _LINK_RE.finditer(link_header)}
+
+
+def _get_gh_runners_page(
+    url: str, headers: Dict[str, str]
+) -> Tuple[List, Dict[str, str]]:
+    """
+    Fetch a single page of organization runners
+
+    Returns:
+        Tuple of the runners on the page and the parsed Link header
+    """
+    response = _HTTP.get(url, headers=headers, timeout=GITHUB_TIMEOUT)
+    response.raise_for_status()
+    return (
+        response.json().get("runners", []),
+        _parse_link_header(response.headers.get("Link")),
+    )
+
+
+def _read_gh_runners_cache() -> Optional[List]:
+    """
+    Read runners cached on disk by a previous call, possibly in another process
+
+    The file is only trusted if it is owned by the current user and not
+    writable by anyone else, so a file planted in a shared temp directory
+    is ignored.
+
+    Returns:
+        Cached runners, or None if the cache is missing, untrusted, unreadable
+        or expired
+    """
+    try:
+        with open(GH_RUNNERS_CACHE_PATH, "rb") as f:
+            if hasattr(os, "getuid"):
+                st = os.fstat(f.fileno())
+                if st.st_uid != os.getuid() or st.st_mode & 0o022:
+                    return None
+            cached = _json_loads(f.read())
+        if time.time() - cached["ts"] < GH_RUNNERS_CACHE_TTL:
+            return cached["data"]
+    except (OSError, ValueError, KeyError, TypeError):
+        pass
+    return None
+
+
+def _write_gh_runners_cache(runners: List) -> None:
+    """Atomically write runners to the on-disk cache, readable only by this user"""
+    cache_dir, cache_name = os.path.split(GH_RUNNERS_CACHE_PATH)
+    tmp_path = None
+    try:
+        # mkstemp creates the file exclusively with mode 0600 under a random name
+        fd, tmp_path = tempfile.mkstemp(prefix=f"{cache_name}.", dir=cache_dir)
+        with os.fdopen(fd, "wb") as f:
+            f.write(_json_dumps({"ts": time.time(), "data": runners}))
+        os.replace(tmp_path, GH_RUNNERS_CACHE_PATH)
+    except OSError:
+        if tmp_path is not None:
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
 
 
 @lru_cache
@@ -327,6 +563,9 @@ def _get_all_gh_runners() -> List:
     """
     List runners that are registered to GitHub at the organization level
 
+    Results are cached on disk for GH_RUNNERS_CACHE_TTL seconds, so that
+    freshly started processes do not have to walk every page again.
+
     Returns:
         List of runners connected to GitHub
     """
@@ -334,55 +573,54 @@ def _get_all_gh_runners() -> List:
     if not github_token:
         return ["GITHUB_TOKEN_ADMIN_READ environment variable is not set."]
 
-    import re
+    runners = _read_gh_runners_cache()
+    if runners is not None:
+        return runners
+
+    runners = _fetch_all_gh_runners(github_token)
+    # Errors are reported as strings and must not be cached
+    if all(isinstance(runner, dict) for runner in runners):
+        _write_gh_runners_cache(runners)
+    return runners
+
+
+def _fetch_all_gh_runners(github_token: str) -> List:
+    """
+    Fetch all organization runners from the GitHub API
 
+    Returns:
+        List of runners, or a single error message
+    """
     # GitHub API endpoint for organization's self-hosted runners
     # This assumes the organization name is known or can be configured
     org_name = "pytorch"
     base_url = f"https://api.github.com/orgs/{org_name}/actions/runners"
 
     # Set default per_page to 100 (GitHub max)
-    current_url = f"{base_url}?per_page=100"
-
-    headers = {
-        "Authorization": f"Bearer {github_token}",
-        "Accept": "application/vnd.github.v3+json",
-    }
+    first_url = f"{base_url}?per_page=100"
 
-    # Initialize list for all runners
-    all_instances = []
+    headers = {"Authorization": f"Bearer {github_token}"}
 
     try:
-        # Loop through all pages
-        while current_url:
-            # Make request to GitHub API
-            response = requests.get(current_url, headers=headers)
-            response.raise_for_status()
-
-            data = response.json()
-
-            all_instances.extend(data.get("runners", []))
-
-            # Check for Link header to handle pagination
-            link_header = response.headers.get("Link")
-
-            # Reset current_url to None to exit loop if no next page
-            current_url = None
-
-            # Parse Link header if present to get next page URL
-            if link_header:
-                links = {}
-                # Parse the Link header format: <url>; rel="next", <url>; rel="last", etc.
-                for link in link_header.split(","):
-                    # Extract URL and rel values
-                    url_match = re.search(r"<(.+?)>", link)
-                    rel_match = re.search(r'rel="(.+?)"', link)
-
-                    if url_match and rel_match:
-                        links[rel_match.group(1)] = url_match.group(1)
-
-                # Get the next page URL if it exists
-                current_url = links.get("next")
+        runners, links = _get_gh_runners_page(first_url, headers)
+        all_instances = list(runners)
+
+        last_url = links.get("last")
+        if last_url:
+            # The first page tells us how many pages there are,
+            # so fetch the remaining ones concurrently
+            last_page = int(parse_qs(urlparse(last_url).query)["page"][0])
+            urls = [f"{first_url}&page={page}" for page in range(2, last_page + 1)]
+            with ThreadPoolExecutor(max_workers=16) as ex:
+                for runners, _ in ex.map(
+                    lambda url: _get_gh_runners_page(url, headers), urls
+                ):
+                    all_instances.extend(runners)
+        else:
+            # Otherwise follow the next links one page at a time
+            while "next" in links:
+                runners, links = _get_gh_runners_page(links["next"], headers)
+                all_instances.extend(runners)
 
         return all_instances
 
@@ -393,6 +631,7 @@ def _get_all_gh_runners() -> List:
 
 
 @mcp.tool()
+@_run_in_thread
 def list_runners_connected_to_github(search_str: str) -> List:
     """
     List runners that are registered to GitHub at the organization level
@@ -408,13 +647,23 @@ def list_runners_connected_to_github(search_str: str) -> List:
     if not all_instances:
         return ["No EC2 instances found connected to GitHub."]
 
+    # Plain strings are matched with a substring scan, anything else as a regex
+    if _REGEX_METACHARS.isdisjoint(search_str):
+        needle = search_str.lower()
+
+        def matches(line: str) -> bool:
+            return needle in line.lower()
+
+    else:
+        matches = re.compile(search_str, re.IGNORECASE).search
+
     # Size of output is too large so this edits out the fields names
-    return [
+    lines = (
         f"{instance['id']} {instance['name']} ({instance['status']}) {'busy' if instance['busy'] else ''} {' '.join([l['name'] for l in instance['labels']])}"
         for instance in all_instances
-        # crude filtering
-        if re.search(search_str, json.dumps(instance), re.IGNORECASE)
-    ]
+    )
+    # crude filtering on the formatted line
+    return [line for line in lines if matches(line)]
 
 
 def main():